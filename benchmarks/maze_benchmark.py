@@ -0,0 +1,40 @@
+"""Benchmark procedural maze generation and solving.
+
+Run from the repository root:
+
+    python benchmarks/maze_benchmark.py [size] [runs]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mini import Maze  # noqa: E402
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    generate_times = []
+    solve_times = []
+    for seed in range(runs):
+        start = time.perf_counter()
+        maze = Maze(size, size, seed)
+        generated = time.perf_counter()
+        route = maze.solve((0, 0), (size - 1, size - 1))
+        solved = time.perf_counter()
+
+        generate_times.append(generated - start)
+        solve_times.append(solved - generated)
+
+    print(f"Maze {size}x{size}, {runs} runs ({len(maze.grid)} bytes per grid)")
+    print(f"  generate: best {min(generate_times) * 1000:.1f} ms, "
+          f"mean {sum(generate_times) / runs * 1000:.1f} ms")
+    print(f"  solve:    best {min(solve_times) * 1000:.1f} ms, "
+          f"mean {sum(solve_times) / runs * 1000:.1f} ms (route {len(route) - 1} moves)")
+
+
+if __name__ == "__main__":
+    main()
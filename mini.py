@@ -5,21 +5,624 @@ import random
 import json
 from datetime import datetime
 from collections import deque
+from array import array
+import importlib.metadata
+import itertools
+import importlib.util
+import queue
 import shutil
+import contextlib
+import copy
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+PLUGIN_DIR = os.path.join(BASE_DIR, "plugins")
+
+
+class Pipe:
+    """Bounded byte pipe backed by a preallocated ring buffer"""
+
+    def __init__(self, capacity=65536):
+        if capacity <= 0:
+            raise ValueError("pipe capacity must be positive")
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._head = 0  # Next byte to read
+        self._size = 0  # Bytes currently buffered
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self.closed = False
+
+    def __len__(self):
+        return self._size
+
+    def _copy_in(self, source):
+        """Copy as much of source as fits into the ring (lock held)"""
+        count = min(len(source), self.capacity - self._size)
+        tail = (self._head + self._size) % self.capacity
+        first = min(count, self.capacity - tail)
+        self._view[tail:tail + first] = source[:first]
+        if count > first:
+            self._view[:count - first] = source[first:count]
+        self._size += count
+        return count
+
+    def _copy_out(self, target):
+        """Copy buffered bytes into target (lock held)"""
+        count = min(len(target), self._size)
+        first = min(count, self.capacity - self._head)
+        target[:first] = self._view[self._head:self._head + first]
+        if count > first:
+            target[first:count] = self._view[:count - first]
+        self._head = (self._head + count) % self.capacity
+        self._size -= count
+        return count
+
+    def write(self, data, block=True, timeout=None, atomic=False):
+        """Write bytes, blocking for space unless block is False.
+
+        Returns the number of bytes written. Non-blocking writes store
+        whatever fits, which may be nothing. An atomic write stores all of
+        data in one piece or nothing at all.
+        """
+        source = memoryview(data).cast("B")
+        if atomic and len(source) > self.capacity:
+            raise ValueError("atomic write larger than pipe capacity")
+        written = 0
+        with self._not_full:
+            if atomic:
+                while self.capacity - self._size < len(source):
+                    if self.closed:
+                        raise BrokenPipeError("write to closed pipe")
+                    if not block or not self._not_full.wait(timeout):
+                        return 0
+            while written < len(source):
+                if self.closed:
+                    raise BrokenPipeError("write to closed pipe")
+                if self._size == self.capacity:
+                    if not block:
+                        break
+                    if not self._not_full.wait(timeout):
+                        break
+                    continue
+                written += self._copy_in(source[written:])
+                self._not_empty.notify_all()
+        return written
+
+    def readinto(self, buffer, block=True, timeout=None):
+        """Read directly into a writable buffer without intermediate copies.
+
+        Returns the number of bytes read, 0 at end of file, or None if
+        the pipe is empty and the read would block.
+        """
+        target = memoryview(buffer).cast("B")
+        if not len(target):
+            # 0 means end of file, so an empty buffer can't be answered
+            raise ValueError("readinto needs a non-empty buffer")
+        with self._not_empty:
+            while self._size == 0:
+                if self.closed:
+                    return 0
+                if not block or not self._not_empty.wait(timeout):
+                    return None
+            count = self._copy_out(target)
+            self._not_full.notify_all()
+        return count
+
+    def read(self, size=-1, block=True, timeout=None):
+        """Read up to size bytes (everything buffered if size < 0).
+
+        Returns b"" at end of file, or None if the read would block.
+        """
+        with self._not_empty:
+            while self._size == 0:
+                if self.closed:
+                    return b""
+                if not block or not self._not_empty.wait(timeout):
+                    return None
+            if size < 0 or size > self._size:
+                size = self._size
+            data = bytearray(size)
+            self._copy_out(memoryview(data))
+            self._not_full.notify_all()
+        return bytes(data)
+
+    def close(self):
+        """Close the write end; readers drain remaining bytes then see EOF"""
+        with self._lock:
+            self.closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+
+class MessageQueue:
+    """Bounded, optionally typed message queue with backpressure"""
+
+    def __init__(self, maxsize=1024, msg_type=None):
+        if maxsize <= 0:
+            raise ValueError("queue size must be positive")
+        self.maxsize = maxsize
+        self.msg_type = msg_type
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _check_type(self, item):
+        if self.msg_type is not None and not isinstance(item, self.msg_type):
+            raise TypeError(f"expected {self.msg_type.__name__}, got {type(item).__name__}")
+
+    def put(self, item, block=True, timeout=None):
+        """Enqueue one message, raising queue.Full if there is no room"""
+        self._check_type(item)
+        with self._not_full:
+            while len(self._items) >= self.maxsize:
+                if not block or not self._not_full.wait(timeout):
+                    raise queue.Full
+            self._items.append(item)
+            self._not_empty.notify()
+
+    def put_many(self, items, block=True, timeout=None):
+        """Enqueue a batch under as few lock round-trips as possible.
+
+        Returns the number of messages enqueued; a non-blocking or timed
+        out call may enqueue only a prefix of the batch.
+        """
+        items = list(items)
+        for item in items:
+            self._check_type(item)
+        sent = 0
+        with self._not_full:
+            while sent < len(items):
+                room = self.maxsize - len(self._items)
+                if room == 0:
+                    if not block or not self._not_full.wait(timeout):
+                        break
+                    continue
+                self._items.extend(items[sent:sent + room])
+                sent += min(room, len(items) - sent)
+                self._not_empty.notify_all()
+        return sent
+
+    def get(self, block=True, timeout=None):
+        """Dequeue one message, raising queue.Empty if none is available"""
+        with self._not_empty:
+            while not self._items:
+                if not block or not self._not_empty.wait(timeout):
+                    raise queue.Empty
+            item = self._items.popleft()
+            self._not_full.notify()
+        return item
+
+    def get_many(self, max_items=None, block=True, timeout=None):
+        """Dequeue up to max_items messages in one go (all if None)"""
+        with self._not_empty:
+            while not self._items:
+                if not block or not self._not_empty.wait(timeout):
+                    return []
+            count = len(self._items) if max_items is None else min(max_items, len(self._items))
+            popleft = self._items.popleft
+            batch = [popleft() for _ in range(count)]
+            self._not_full.notify_all()
+        return batch
+
+
+class Maze:
+    """Procedurally generated perfect maze stored as one byte per cell.
+
+    Cells are carved with an iterative randomised depth-first search, so
+    passages wind in every direction and there is no open corridor to
+    follow. The bytearray carries a one-cell border around the maze, which
+    lets the generator and the solver look at neighbours without bounds
+    checks. Each cell has a visited/border bit plus bits for an open north
+    or east side; south and west are read off the neighbouring cells.
+    """
+
+    BLOCKED = 1  # Border cell, or a cell the generator has already visited
+    NORTH = 2
+    EAST = 4
+    DIRECTIONS = {
+        "north": (0, -1), "n": (0, -1),
+        "south": (0, 1), "s": (0, 1),
+        "east": (1, 0), "e": (1, 0),
+        "west": (-1, 0), "w": (-1, 0)
+    }
+
+    def __init__(self, width, height, seed=None):
+        if width < 1 or height < 1:
+            raise ValueError("maze dimensions must be positive")
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.stride = width + 2
+
+        grid = bytearray([self.BLOCKED]) * (self.stride * (height + 2))
+        for y in range(1, height + 1):
+            grid[y * self.stride + 1:y * self.stride + 1 + width] = bytes(width)
+        self.grid = grid
+        self._carve(random.Random(seed))
+
+    def _carve(self, rng):
+        """Randomised depth-first search over the whole grid"""
+        grid = self.grid
+        stride = self.stride
+        north, east, blocked = self.NORTH, self.EAST, self.BLOCKED
+        # One random byte per carved passage picks the order to try neighbours
+        orders = list(itertools.permutations((-stride, stride, -1, 1)))
+        choices = rng.randbytes(self.width * self.height)
+        picked = 0
+
+        start = self._index(0, 0)
+        grid[start] = blocked
+        stack = [start]
+        push, pop = stack.append, stack.pop
+        while stack:
+            i = stack[-1]
+            for step in orders[choices[picked] % 24]:
+                if not grid[i + step]:
+                    break
+            else:
+                pop()
+                continue
+
+            picked += 1
+            j = i + step
+            if step == -stride:
+                grid[i] |= north
+                grid[j] = blocked
+            elif step == stride:
+                grid[j] = blocked | north
+            elif step == 1:
+                grid[i] |= east
+                grid[j] = blocked
+            else:
+                grid[j] = blocked | east
+            push(j)
+
+    def _index(self, x, y):
+        return (y + 1) * self.stride + x + 1
+
+    def can_move(self, x, y, direction):
+        """Check whether there is a passage from (x, y) in direction"""
+        dx, dy = self.DIRECTIONS[direction]
+        i = self._index(x, y)
+        if dy == -1:
+            return bool(self.grid[i] & self.NORTH)
+        if dy == 1:
+            return bool(self.grid[i + self.stride] & self.NORTH)
+        if dx == 1:
+            return bool(self.grid[i] & self.EAST)
+        return bool(self.grid[i - 1] & self.EAST)
+
+    def solve(self, start, goal):
+        """Return the shortest path from start to goal as (x, y) cells.
+
+        Breadth-first search that remembers in a bytearray which way each
+        cell was entered, so the route can be traced back from the goal.
+        Returns [] if goal is unreachable.
+        """
+        grid = self.grid
+        stride = self.stride
+        north, east = self.NORTH, self.EAST
+        source = self._index(*start)
+        target = self._index(*goal)
+
+        # 1-4: entered moving north/south/east/west, 5: the start cell
+        came_from = bytearray(len(grid))
+        came_from[source] = 5
+        # A flat list serves as the queue: iterating it picks up appended cells
+        pending = [source]
+        add = pending.append
+        for i in pending:
+            if i == target:
+                break
+            cell = grid[i]
+            if cell & north and not came_from[i - stride]:
+                came_from[i - stride] = 1
+                add(i - stride)
+            if grid[i + stride] & north and not came_from[i + stride]:
+                came_from[i + stride] = 2
+                add(i + stride)
+            if cell & east and not came_from[i + 1]:
+                came_from[i + 1] = 3
+                add(i + 1)
+            if grid[i - 1] & east and not came_from[i - 1]:
+                came_from[i - 1] = 4
+                add(i - 1)
+
+        if not came_from[target]:
+            return []
+        back = {1: stride, 2: -stride, 3: -1, 4: 1}
+        route = [target]
+        i = target
+        while came_from[i] != 5:
+            i += back[came_from[i]]
+            route.append(i)
+        return [(i % stride - 1, i // stride - 1) for i in reversed(route)]
+
+    def hint(self, position, goal):
+        """Name the direction of the next optimal move, or None at the goal"""
+        route = self.solve(position, goal)
+        if len(route) < 2:
+            return None
+        (x, y), (nx, ny) = route[0], route[1]
+        for direction in ("north", "south", "east", "west"):
+            if self.DIRECTIONS[direction] == (nx - x, ny - y):
+                return direction
+
+    def render(self, markers, center=None, radius=6):
+        """Draw the maze (or a window around center) as ASCII art"""
+        if center is None:
+            x0, y0, x1, y1 = 0, 0, self.width, self.height
+        else:
+            x0 = max(center[0] - radius, 0)
+            y0 = max(center[1] - radius, 0)
+            x1 = min(center[0] + radius + 1, self.width)
+            y1 = min(center[1] + radius + 1, self.height)
+
+        lines = []
+        for y in range(y0, y1):
+            walls = "+"
+            cells = "|" if x0 == 0 or not self.can_move(x0, y, "west") else " "
+            for x in range(x0, x1):
+                walls += "   +" if self.can_move(x, y, "north") else "---+"
+                cells += f" {markers.get((x, y), ' ')} "
+                cells += " " if self.can_move(x, y, "east") else "|"
+            lines.append(walls)
+            lines.append(cells)
+        if y1 == self.height:
+            lines.append("+" + "---+" * (x1 - x0))
+        return "\n".join(lines)
+
+
+class ContentBank:
+    """Line-oriented data file with O(1) random access to entries.
+
+    The byte offset of every line is indexed on first use and kept in a
+    compact array, so fetching an entry is a single seek and readline no
+    matter how large the file grows.
+    """
+
+    def __init__(self, path, parse=None):
+        self.path = path
+        self.parse = parse
+        self._offsets = None
+        self._lock = threading.Lock()
+
+    def _index(self):
+        with self._lock:
+            if self._offsets is None:
+                offsets = array("Q")
+                position = 0
+                with open(self.path, "rb") as f:
+                    for line in f:
+                        if line.strip():
+                            offsets.append(position)
+                        position += len(line)
+                self._offsets = offsets
+        return self._offsets
+
+    def __len__(self):
+        return len(self._index())
+
+    def __getitem__(self, i):
+        offset = self._index()[i]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            entry = f.readline().decode("utf-8").rstrip("\r\n")
+        return self.parse(entry) if self.parse else entry
+
+    def choice(self, rng=random):
+        """Return one random entry"""
+        return self[rng.randrange(len(self))]
+
+    def sample(self, k, rng=random):
+        """Return up to k distinct random entries"""
+        return [self[i] for i in rng.sample(range(len(self)), min(k, len(self)))]
+
+
+class PluginRegistry:
+    """Finds command and game plugins and imports each on first use.
+
+    Plugins are modules named cmd_<name>.py or game_<name>.py in the
+    plugins directory, or installed packages advertised under the
+    minios.commands / minios.games entry point groups. A plugin module
+    provides run(os_system, *args).
+    """
+
+    PREFIXES = {"command": "cmd", "game": "game"}
+    ENTRY_POINT_GROUPS = {"command": "minios.commands", "game": "minios.games"}
+
+    def __init__(self, plugin_dir=PLUGIN_DIR):
+        self.plugin_dir = plugin_dir
+        self._modules = {}
+        self._entry_points = {}
+
+    def _entry_points_for(self, kind):
+        # Scanning installed distributions is slow, so do it once per kind
+        if kind not in self._entry_points:
+            group = self.ENTRY_POINT_GROUPS[kind]
+            self._entry_points[kind] = {
+                ep.name: ep for ep in importlib.metadata.entry_points(group=group)
+            }
+        return self._entry_points[kind]
+
+    def get(self, kind, name):
+        """Return the plugin module for name, importing it if needed"""
+        key = (kind, name)
+        if key in self._modules:
+            return self._modules[key]
+        if not name.isidentifier():
+            return None
+
+        module_name = f"{self.PREFIXES[kind]}_{name}"
+        path = os.path.join(self.plugin_dir, module_name + ".py")
+        if os.path.isfile(path):
+            spec = importlib.util.spec_from_file_location(f"minios_plugins.{module_name}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        elif name in self._entry_points_for(kind):
+            module = self._entry_points_for(kind)[name].load()
+        else:
+            return None
+
+        self._modules[key] = module
+        return module
+
+    def names(self, kind):
+        """List available plugin names without importing them"""
+        prefix = self.PREFIXES[kind] + "_"
+        names = set(self._entry_points_for(kind))
+        if os.path.isdir(self.plugin_dir):
+            for entry in os.scandir(self.plugin_dir):
+                if entry.name.startswith(prefix) and entry.name.endswith(".py"):
+                    names.add(entry.name[len(prefix):-3])
+        return sorted(names)
+
+    def run(self, kind, name, os_system, *args):
+        """Run a plugin, returning False if no such plugin exists"""
+        module = self.get(kind, name)
+        if module is None:
+            return False
+        module.run(os_system, *args)
+        return True
+
+
+class TokenBucket:
+    """Token bucket rate limiter: rate tokens per second, up to capacity"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def consume(self, tokens=1):
+        """Take tokens if available; returns False when the caller must wait"""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < tokens:
+                return False
+            self.tokens -= tokens
+            return True
+
+
+class VirtualClock:
+    """Manually advanced clock so replays do not depend on wall time"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class SessionRecorder:
+    """Records the commands and inputs of one session as a compact trace.
+
+    A trace is JSON lines: a header object with the session seed, user,
+    start time and a snapshot of the session state, then one
+    [milliseconds, kind, text] event per line where kind is "c" for a
+    command and "i" for an answer to an input prompt.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path, seed, user, clock, state=None):
+        self.path = path
+        self.clock = clock
+        self.started = clock()
+        self.header = {"version": self.VERSION, "seed": seed, "user": user,
+                       "started": self.started, "state": state}
+        self.events = []
+
+    def record(self, kind, text):
+        self.events.append([round((self.clock() - self.started) * 1000), kind, text])
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.header) + "\n")
+            for event in self.events:
+                f.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    @staticmethod
+    def load(path):
+        """Read a trace file into (header, events)"""
+        with open(path, encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            events = [json.loads(line) for line in f if line.strip()]
+        return header, events
+
 
 class MiniOS:
-    def __init__(self):
+    DISK_CAPACITY = 16 * 1024 * 1024  # Simulated disk size in bytes
+
+    # Per-role resource limits; None means unlimited
+    ROLE_LIMITS = {
+        "admin": {"bytes": None, "inodes": None, "processes": None,
+                  "commands_per_sec": None, "command_burst": None},
+        "user": {"bytes": 1024 * 1024, "inodes": 500, "processes": 16,
+                 "commands_per_sec": 5, "command_burst": 20},
+        "guest": {"bytes": 64 * 1024, "inodes": 50, "processes": 2,
+                  "commands_per_sec": 1, "command_burst": 5}
+    }
+
+    def __init__(self, seed=None, clock=None, input_func=None, sleep=None):
+        # Randomness, time and input are injectable so sessions can be replayed
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.clock = clock or time.time
+        self.sleep = sleep or time.sleep
+        self.input_func = input_func or input
+        self.recorder = None
         self.current_user = None
         self.processes = {}
         self.next_pid = 1
         self.file_system = {}
         self.running = True
         self.command_history = deque(maxlen=10)
-        self.boot_time = datetime.now()
+        self.boot_time = self._now()
         self.user_points = 0
         self.system_health = 100
         self.temperature = 35  # System temperature
         self.background_tasks_active = True
+        self.ipc_channels = {}  # Named pipes and message queues
+        self.plugins = PluginRegistry()
+        self.fortunes = ContentBank(os.path.join(DATA_DIR, "fortunes.txt"))
+        self.trivia_bank = ContentBank(os.path.join(DATA_DIR, "trivia.jsonl"), json.loads)
+        self._help_categories = None
+        self.user_roles = {"admin": "admin", "user": "user", "guest": "guest"}
+        self.role_limits = {role: dict(limits) for role, limits in self.ROLE_LIMITS.items()}
+        self.user_limits = {}  # Per-user overrides of the role limits
+        self.quota_usage = {}  # username -> {"bytes", "inodes", "processes"}
+        self.rate_limiters = {}
+        self._process_context = threading.local()
+        self._quota_lock = threading.Lock()
+        self.dir_usage = {}  # directory -> [bytes, files] for everything below it
+        self._fs_lock = threading.RLock()
+
+    def _now(self):
+        """Current time from the injected clock"""
+        return datetime.fromtimestamp(self.clock())
+
+    def read_input(self, prompt=""):
+        """Read user input, recording it when a session is being recorded"""
+        value = self.input_func(prompt)
+        if self.recorder:
+            self.recorder.record("i", value)
+        return value
 
     def boot(self):
         """Boot up the mini OS with animations"""
@@ -31,18 +634,18 @@ class MiniOS:
         # Boot animation
         for i in range(5):
             print("Booting" + "." * (i % 4) + " " * (3 - (i % 4)))
-            time.sleep(0.3)
+            self.sleep(0.3)
             print("\033[F\033[K", end="")  # Clear line
 
         print("Initializing file system...")
         self._init_file_system()
-        time.sleep(0.5)
+        self.sleep(0.5)
 
         print("Starting system services...")
-        time.sleep(0.5)
+        self.sleep(0.5)
 
         print("Loading user interface...")
-        time.sleep(0.5)
+        self.sleep(0.5)
 
         # ASCII art boot complete
         print(r"""
@@ -59,29 +662,31 @@ class MiniOS:
     def _init_file_system(self):
         """Initialize enhanced file system structure"""
         self.file_system = {
-            "/": {"type": "directory", "contents": {}, "created": datetime.now().isoformat()},
-            "/home": {"type": "directory", "contents": {}, "created": datetime.now().isoformat()},
-            "/system": {"type": "directory", "contents": {}, "created": datetime.now().isoformat()},
-            "/games": {"type": "directory", "contents": {}, "created": datetime.now().isoformat()},
+            "/": {"type": "directory", "contents": {}, "created": self._now().isoformat()},
+            "/home": {"type": "directory", "contents": {}, "created": self._now().isoformat()},
+            "/system": {"type": "directory", "contents": {}, "created": self._now().isoformat()},
+            "/games": {"type": "directory", "contents": {}, "created": self._now().isoformat()},
+            "/system/profiles": {"type": "directory", "contents": {}, "created": self._now().isoformat()},
             "/system/readme.txt": {
                 "type": "file",
                 "content": "Welcome to MiniOS 2.0!\nExplore the system with 'help' command.\nEarn points by using the system!",
-                "created": datetime.now().isoformat(),
-                "modified": datetime.now().isoformat()
+                "created": self._now().isoformat(),
+                "modified": self._now().isoformat()
             },
             "/system/motd.txt": {
                 "type": "file",
                 "content": "Message of the Day:\nKeep learning and exploring!",
-                "created": datetime.now().isoformat(),
-                "modified": datetime.now().isoformat()
+                "created": self._now().isoformat(),
+                "modified": self._now().isoformat()
             },
             "/games/instructions.txt": {
                 "type": "file",
-                "content": "Available games:\n- guess: Number guessing game\n- math: Math challenge\n- maze: Text-based maze",
-                "created": datetime.now().isoformat(),
-                "modified": datetime.now().isoformat()
+                "content": "Available games:\n- guess: Number guessing game\n- math: Math challenge\n- maze: Procedural maze",
+                "created": self._now().isoformat(),
+                "modified": self._now().isoformat()
             }
         }
+        self._rebuild_usage()
 
     def login(self):
         """Enhanced login system with user profiles"""
@@ -96,8 +701,8 @@ class MiniOS:
 
         attempts = 3
         while attempts > 0:
-            username = input("Username: ").strip()
-            password = input("Password: ").strip()
+            username = self.read_input("Username: ").strip()
+            password = self.read_input("Password: ").strip()
 
             if username in users and users[username] == password:
                 self.current_user = username
@@ -111,7 +716,7 @@ class MiniOS:
                     f"🎯 Ready for adventure, {username}?",
                     f"💫 Hello {username}, let's explore!"
                 ]
-                print(random.choice(welcome_messages))
+                print(self.rng.choice(welcome_messages))
                 print(f"📊 Your current points: {self.user_points}")
                 return True
             else:
@@ -129,16 +734,16 @@ class MiniOS:
             self.file_system[user_home] = {
                 "type": "directory",
                 "contents": {},
-                "created": datetime.now().isoformat()
+                "created": self._now().isoformat()
             }
 
             # Create sample files for user
-            self.file_system[f"{user_home}/welcome.txt"] = {
+            self._store_file(f"{user_home}/welcome.txt", {
                 "type": "file",
                 "content": f"Welcome to your home directory, {username}!\n\nTips:\n- Use 'help' to see commands\n- Play games with 'game' command\n- Explore the file system with 'ls' and 'cd'",
-                "created": datetime.now().isoformat(),
-                "modified": datetime.now().isoformat()
-            }
+                "created": self._now().isoformat(),
+                "modified": self._now().isoformat()
+            })
 
     def _load_user_profile(self, username):
         """Load or create user profile with points"""
@@ -155,13 +760,13 @@ class MiniOS:
     def _save_user_profile(self, username):
         """Save user profile"""
         profile_file = f"/system/profiles/{username}.json"
-        profile_data = {"points": self.user_points, "last_save": datetime.now().isoformat()}
-        self.file_system[profile_file] = {
+        profile_data = {"points": self.user_points, "last_save": self._now().isoformat()}
+        self._store_file(profile_file, {
             "type": "file",
             "content": json.dumps(profile_data, indent=2),
-            "created": datetime.now().isoformat(),
-            "modified": datetime.now().isoformat()
-        }
+            "created": self._now().isoformat(),
+            "modified": self._now().isoformat()
+        })
 
     def award_points(self, points, reason=""):
         """Award points to user for system interaction"""
@@ -174,19 +779,105 @@ class MiniOS:
         if self.current_user:
             self._save_user_profile(self.current_user)
 
-    def create_process(self, name, target_function, *args):
-        """Create a new process with enhanced tracking"""
+    def get_limits(self, username):
+        """Resolve a user's limits from their role plus any overrides"""
+        limits = dict(self.role_limits[self.user_roles.get(username, "guest")])
+        limits.update(self.user_limits.get(username, {}))
+        return limits
+
+    def set_user_limits(self, username, **limits):
+        """Override individual limits (bytes, inodes, processes, ...) for a user"""
+        self.user_limits.setdefault(username, {}).update(limits)
+        self.rate_limiters.pop(username, None)
+
+    def _charge_quota(self, username, bytes_used=0, inodes=0, processes=0):
+        """Reserve resources against a user's quota; False if it would exceed"""
+        if username is None:
+            return True
+
+        limits = self.get_limits(username)
+        with self._quota_lock:
+            usage = self.quota_usage.setdefault(username, {"bytes": 0, "inodes": 0, "processes": 0})
+            for resource, amount in (("bytes", bytes_used), ("inodes", inodes), ("processes", processes)):
+                limit = limits[resource]
+                if amount > 0 and limit is not None and usage[resource] + amount > limit:
+                    print(f"❌ Quota exceeded: {resource} limit is {limit} for {username}")
+                    return False
+            usage["bytes"] += bytes_used
+            usage["inodes"] += inodes
+            usage["processes"] += processes
+        return True
+
+    def _release_quota(self, username, bytes_used=0, inodes=0, processes=0):
+        """Return resources previously charged to a user"""
+        if username is None:
+            return
+
+        with self._quota_lock:
+            usage = self.quota_usage.get(username)
+            if usage:
+                usage["bytes"] -= bytes_used
+                usage["inodes"] -= inodes
+                usage["processes"] -= processes
+
+    def _rate_limiter(self, username):
+        """The user's token bucket, or None if they are not rate limited"""
+        bucket = self.rate_limiters.get(username)
+        if bucket is None and username is not None:
+            limits = self.get_limits(username)
+            if limits["commands_per_sec"] is not None:
+                bucket = TokenBucket(limits["commands_per_sec"], limits["command_burst"], self.clock)
+                self.rate_limiters[username] = bucket
+        return bucket
+
+    def _check_rate_limit(self, username):
+        """Take one command token from the user's bucket"""
+        bucket = self._rate_limiter(username)
+        return bucket is None or bucket.consume()
+
+    def show_quota(self):
+        """Show the current user's resource usage against their limits"""
+        limits = self.get_limits(self.current_user)
+        usage = self.quota_usage.get(self.current_user, {"bytes": 0, "inodes": 0, "processes": 0})
+        role = self.user_roles.get(self.current_user, "guest")
+
+        print(f"\n📦 Quota for {self.current_user} ({role})")
+        for resource in ("bytes", "inodes", "processes"):
+            limit = limits[resource]
+            print(f"{resource.capitalize():<12}: {usage[resource]} / {'unlimited' if limit is None else limit}")
+        rate = limits["commands_per_sec"]
+        rate_text = "unlimited" if rate is None else f"{rate}/s (burst {limits['command_burst']})"
+        print(f"{'Commands':<12}: {rate_text}")
+
+    def create_process(self, name, target_function, *args, system=False):
+        """Create a new process with enhanced tracking.
+
+        System processes have no owner and don't count against user quotas.
+        """
+        owner = None if system else self.current_user
+        if not self._charge_quota(owner, processes=1):
+            return None
+
         pid = self.next_pid
         self.next_pid += 1
 
+        def run_process():
+            self._process_context.pid = pid
+            try:
+                target_function(*args)
+            finally:
+                self._end_process(pid)
+
         process = {
             "pid": pid,
             "name": name,
+            "owner": owner,
             "status": "running",
-            "start_time": datetime.now(),
-            "cpu_usage": random.randint(1, 10),
-            "memory_usage": random.randint(10, 100),
-            "thread": threading.Thread(target=target_function, args=args, daemon=True)
+            "start_time": self._now(),
+            "cpu_usage": self.rng.randint(1, 10),
+            "memory_usage": self.rng.randint(10, 100),
+            "stop": threading.Event(),
+            "thread": threading.Thread(target=run_process, daemon=True)
         }
 
         self.processes[pid] = process
@@ -211,7 +902,7 @@ class MiniOS:
                 active_processes += 1
                 total_cpu += process["cpu_usage"]
                 total_memory += process["memory_usage"]
-                uptime = datetime.now() - process["start_time"]
+                uptime = self._now() - process["start_time"]
                 print(f"{pid:<6} {process['name']:<15} {process['status']:<10} "
                       f"{process['cpu_usage']:<6} {process['memory_usage']:<8}MB "
                       f"{str(uptime).split('.')[0]:<12}")
@@ -224,7 +915,7 @@ class MiniOS:
 
     def system_info(self):
         """Enhanced system information with health metrics"""
-        uptime = datetime.now() - self.boot_time
+        uptime = self._now() - self.boot_time
         terminal_width = shutil.get_terminal_size().columns
 
         print("\n" + "="*terminal_width)
@@ -259,16 +950,18 @@ class MiniOS:
 
         self.award_points(1, "for checking system info")
 
-    def play_game(self, game_name=None):
+    def play_game(self, game_name=None, *args):
         """Game launcher with multiple mini-games"""
         if not game_name:
             print("\n🎮 Available Games:")
             print("1. guess  - Number guessing game")
             print("2. math   - Math challenge")
-            print("3. maze   - Text-based maze adventure")
+            print("3. maze   - Procedural maze (game maze [size] [seed])")
             print("4. trivia - System knowledge quiz")
+            for name in self.plugins.names("game"):
+                print(f"•  {name:<6} - Plugin game")
 
-            choice = input("\nChoose a game (name or number): ").strip().lower()
+            choice = self.read_input("\nChoose a game (name or number): ").strip().lower()
 
             game_map = {
                 "1": "guess", "guess": "guess",
@@ -284,24 +977,25 @@ class MiniOS:
         elif game_name == "math":
             self._game_math_challenge()
         elif game_name == "maze":
-            self._game_maze()
+            self._game_maze(*args)
         elif game_name == "trivia":
             self._game_trivia()
-        else:
-            print("Unknown game! Available: guess, math, maze, trivia")
+        elif not self.plugins.run("game", game_name, self, *args):
+            available = ", ".join(["guess", "math", "maze", "trivia"] + self.plugins.names("game"))
+            print(f"Unknown game! Available: {available}")
 
     def _game_guess_number(self):
         """Number guessing game"""
         print("\n🎯 Number Guessing Game!")
         print("I'm thinking of a number between 1 and 100...")
 
-        number = random.randint(1, 100)
+        number = self.rng.randint(1, 100)
         attempts = 0
         max_attempts = 7
 
         while attempts < max_attempts:
             try:
-                guess = int(input(f"\nAttempt {attempts + 1}/{max_attempts}: Your guess? "))
+                guess = int(self.read_input(f"\nAttempt {attempts + 1}/{max_attempts}: Your guess? "))
                 attempts += 1
 
                 if guess < number:
@@ -329,9 +1023,9 @@ class MiniOS:
         score = 0
 
         for round_num in range(5):
-            a = random.randint(1, 20)
-            b = random.randint(1, 20)
-            op = random.choice(operations)
+            a = self.rng.randint(1, 20)
+            b = self.rng.randint(1, 20)
+            op = self.rng.choice(operations)
 
             if op == '+':
                 answer = a + b
@@ -340,10 +1034,10 @@ class MiniOS:
             else:
                 answer = a * b
 
-            start_time = time.time()
+            start_time = self.clock()
             try:
-                user_answer = int(input(f"\nQ{round_num + 1}: {a} {op} {b} = ? "))
-                time_taken = time.time() - start_time
+                user_answer = int(self.read_input(f"\nQ{round_num + 1}: {a} {op} {b} = ? "))
+                time_taken = self.clock() - start_time
 
                 if user_answer == answer:
                     round_points = max(10 - int(time_taken), 1)
@@ -359,42 +1053,65 @@ class MiniOS:
         print(f"\n🏁 Game over! Final score: {score}")
         self.award_points(total_points, f"for math challenge (score: {score})")
 
-    def _game_maze(self):
-        """Simple text-based maze game"""
+    def _game_maze(self, size=None, seed=None):
+        """Procedural maze game with optimal-route scoring"""
         print("\n🧭 Maze Adventure!")
-        print("Find your way through the maze using commands: north, south, east, west")
-
-        # Simple maze structure
-        maze = {
-            'start': {'east': 'room1', 'description': 'You are at the entrance. Path to EAST.'},
-            'room1': {'west': 'start', 'east': 'room2', 'north': 'room3', 'description': 'Crossroads. Paths: WEST, EAST, NORTH'},
-            'room2': {'west': 'room1', 'description': 'Dead end with a key! Go WEST.'},
-            'room3': {'south': 'room1', 'east': 'exit', 'description': 'Path splits. Go SOUTH or EAST'},
-            'exit': {'west': 'room3', 'description': 'You found the exit! 🎉'}
-        }
 
-        current_room = 'start'
-        moves = 0
-        has_key = False
+        try:
+            if size is None:
+                size = self.read_input("Maze size (2-2000, default 8): ").strip() or 8
+            size = max(2, min(int(size), 2000))
+            seed = int(seed) if seed is not None else self.rng.randrange(1000000)
+        except ValueError:
+            print("❌ Size and seed must be numbers!")
+            return
 
-        while current_room != 'exit':
-            print(f"\n{maze[current_room]['description']}")
-            move = input("Which way? ").strip().lower()
+        maze = Maze(size, size, seed)
+        position = (0, 0)
+        goal = (size - 1, size - 1)
+        key = (self.rng.randrange(size), self.rng.randrange(size))
+        optimal = len(maze.solve(position, goal)) - 1
 
-            if move in maze[current_room]:
-                current_room = maze[current_room][move]
-                moves += 1
+        print(f"Maze {size}x{size} (seed {seed}). Reach E from @.")
+        print("Commands: north/south/east/west (or n/s/e/w), hint, quit")
 
-                # Special events
-                if current_room == 'room2' and not has_key:
-                    print("🔑 You found a golden key!")
-                    has_key = True
+        moves = 0
+        hints = 0
+        has_key = False
 
-            else:
+        while position != goal:
+            markers = {goal: "E", position: "@"}
+            if not has_key:
+                markers[key] = "k"
+            print("\n" + maze.render(markers, center=position))
+            move = self.read_input("Which way? ").strip().lower()
+
+            if move == "quit":
+                print(f"🏳️ You gave up after {moves} moves.")
+                return
+            if move == "hint":
+                hints += 1
+                print(f"💡 Head {maze.hint(position, goal)}")
+                continue
+            if move not in Maze.DIRECTIONS:
+                print("❌ Unknown direction! Use north, south, east or west.")
+                continue
+            if not maze.can_move(position[0], position[1], move):
                 print("❌ You can't go that way! Try another direction.")
+                continue
+
+            dx, dy = Maze.DIRECTIONS[move]
+            position = (position[0] + dx, position[1] + dy)
+            moves += 1
+
+            # Special events
+            if position == key and not has_key:
+                print("🔑 You found a golden key!")
+                has_key = True
 
-        points = max(50 - moves * 2, 10)
-        print(f"\n🎉 Congratulations! You escaped in {moves} moves!")
+        extra_moves = moves - optimal
+        points = max(50 - extra_moves * 2 - hints * 5, 10)
+        print(f"\n🎉 Congratulations! You escaped in {moves} moves (optimal: {optimal})!")
         if has_key:
             points += 20
             print("🔑 Bonus: You found the golden key!")
@@ -405,23 +1122,7 @@ class MiniOS:
         """System knowledge trivia game"""
         print("\n🤔 MiniOS Trivia Challenge!")
 
-        questions = [
-            {
-                "question": "What command shows running processes?",
-                "options": ["A) ls", "B) ps", "C) info", "D) kill"],
-                "answer": "B"
-            },
-            {
-                "question": "Which directory contains user files?",
-                "options": ["A) /system", "B) /home", "C) /root", "D) /bin"],
-                "answer": "B"
-            },
-            {
-                "question": "What does PID stand for?",
-                "options": ["A) Process ID", "B) Program ID", "C) Process Index", "D) Program Index"],
-                "answer": "A"
-            }
-        ]
+        questions = self.trivia_bank.sample(3, self.rng)
 
         score = 0
 
@@ -430,7 +1131,7 @@ class MiniOS:
             for option in q['options']:
                 print(f"  {option}")
 
-            answer = input("Your answer (A/B/C/D): ").strip().upper()
+            answer = self.read_input("Your answer (A/B/C/D): ").strip().upper()
 
             if answer == q['answer']:
                 print("✅ Correct!")
@@ -439,8 +1140,8 @@ class MiniOS:
                 print(f"❌ Wrong! Correct answer was {q['answer']}")
 
         points = score * 15
-        print(f"\n📊 You got {score}/3 correct!")
-        self.award_points(points, f"for trivia knowledge ({score}/3 correct)")
+        print(f"\n📊 You got {score}/{len(questions)} correct!")
+        self.award_points(points, f"for trivia knowledge ({score}/{len(questions)} correct)")
 
     def command_help(self):
         """Enhanced help system with categories"""
@@ -448,41 +1149,19 @@ class MiniOS:
         print("🆘 MINIOS HELP SYSTEM")
         print("="*50)
 
-        categories = {
-            "📁 File System": [
-                ("ls [dir]", "List directory contents"),
-                ("cd [dir]", "Change directory"),
-                ("create <file>", "Create new file"),
-                ("read <file>", "Read file content"),
-                ("delete <file>", "Delete file")
-            ],
-            "🔄 Process Management": [
-                ("ps", "List running processes"),
-                ("kill <pid>", "Terminate process"),
-                ("top", "System monitor")
-            ],
-            "🎮 Entertainment": [
-                ("game", "Play games"),
-                ("weather", "Check weather"),
-                ("fortune", "Random fortune")
-            ],
-            "ℹ️ System Info": [
-                ("info", "System information"),
-                ("time", "Current time"),
-                ("history", "Command history"),
-                ("points", "Check your points")
-            ],
-            "⚙️ Utilities": [
-                ("clear", "Clear screen"),
-                ("help", "Show this help"),
-                ("exit", "Shutdown system")
-            ]
-        }
+        if self._help_categories is None:
+            with open(os.path.join(DATA_DIR, "help.json"), encoding="utf-8") as f:
+                self._help_categories = json.load(f)
+
+        categories = dict(self._help_categories)
+        plugin_commands = self.plugins.names("command")
+        if plugin_commands:
+            categories["🧩 Plugins"] = [(name, "Plugin command") for name in plugin_commands]
 
         for category, commands in categories.items():
             print(f"\n{category}:")
             for cmd, desc in commands:
-                print(f"  {cmd:<15} {desc}")
+                print(f"  {cmd:<26} {desc}")
 
         print(f"\n💡 Tip: Earn points by using the system!")
         print("="*50)
@@ -492,8 +1171,8 @@ class MiniOS:
     def check_weather(self):
         """Fun weather simulation"""
         weather_types = ["☀️ Sunny", "🌧️ Rainy", "⛅ Cloudy", "❄️ Snowy", "🌪️ Stormy", "🌈 Rainbow"]
-        temperatures = random.randint(-5, 35)
-        weather = random.choice(weather_types)
+        temperatures = self.rng.randint(-5, 35)
+        weather = self.rng.choice(weather_types)
 
         print(f"\n🌤️  Weather Report:")
         print(f"Condition: {weather}")
@@ -504,17 +1183,7 @@ class MiniOS:
 
     def show_fortune(self):
         """Unix-like fortune command"""
-        fortunes = [
-            "The code that is written today will debug you tomorrow.",
-            "A bug in the code is worth two in the documentation.",
-            "He who laughs last probably made a backup.",
-            "There are 10 types of people: those who understand binary and those who don't.",
-            "The best way to predict the future is to implement it.",
-            "Keep calm and code on!",
-            "Your computer will do what you tell it to do, but that may be much different from what you had in mind.",
-        ]
-
-        fortune = random.choice(fortunes)
+        fortune = self.fortunes.choice(self.rng)
         print(f"\n🔮 Fortune: {fortune}")
         self.award_points(1, "for seeking wisdom")
 
@@ -550,6 +1219,13 @@ class MiniOS:
 
         cmd = parts[0].lower()
 
+        if self.recorder and cmd not in ("record", "replay"):
+            self.recorder.record("c", command)
+
+        if cmd != "exit" and not self._check_rate_limit(self.current_user):
+            print("⏳ Slow down! Command rate limit reached, try again in a moment.")
+            return
+
         # Update system metrics randomly
         self._update_system_metrics()
 
@@ -568,13 +1244,13 @@ class MiniOS:
                 print("\n🔄 System monitor active... Press Ctrl+C to exit")
                 try:
                     for _ in range(5):
-                        time.sleep(2)
+                        self.sleep(2)
                         self._update_system_metrics()
                         # Simulate process changes
                         for process in self.processes.values():
                             if process["status"] == "running":
-                                process["cpu_usage"] = random.randint(1, 15)
-                                process["memory_usage"] = random.randint(5, 50)
+                                process["cpu_usage"] = self.rng.randint(1, 15)
+                                process["memory_usage"] = self.rng.randint(5, 50)
                 except KeyboardInterrupt:
                     print("\nExiting system monitor...")
 
@@ -593,10 +1269,19 @@ class MiniOS:
 
             elif cmd == "create" and len(parts) > 1:
                 filename = parts[1]
-                content = input("Enter file content: ")
+                content = self.read_input("Enter file content: ")
                 if self.create_file(filename, content):
                     self.award_points(3, "for file creation")
 
+            elif cmd == "du":
+                for path in parts[1:] or ["/"]:
+                    self.show_disk_usage(path)
+                self.award_points(1, "for checking disk usage")
+
+            elif cmd == "df":
+                self.show_disk_free()
+                self.award_points(1, "for checking disk space")
+
             elif cmd == "read" and len(parts) > 1:
                 content = self.read_file(parts[1])
                 if content is not None:
@@ -607,9 +1292,36 @@ class MiniOS:
                 if self.delete_file(parts[1]):
                     self.award_points(2, "for file management")
 
+            elif cmd == "mkfifo" and len(parts) > 1:
+                queue_mode = parts[1] == "-q"
+                args = parts[2:] if queue_mode else parts[1:]
+                if not args or (len(args) > 1 and not (args[1].isdigit() and int(args[1]) > 0)):
+                    print("❌ Usage: mkfifo [-q] <name> [size] (size must be a positive number)")
+                elif queue_mode:
+                    self.create_message_queue(args[0], int(args[1]) if len(args) > 1 else 1024, str)
+                else:
+                    self.create_pipe(args[0], int(args[1]) if len(args) > 1 else 65536)
+
+            elif cmd == "send" and len(parts) > 2:
+                message = command.split(None, 2)[2]
+                if self.send_message(parts[1], message):
+                    print(f"📤 Sent to {parts[1]}")
+
+            elif cmd == "recv" and len(parts) > 2 and not parts[2].isdigit():
+                print("❌ Usage: recv <name> [bytes]")
+
+            elif cmd == "recv" and len(parts) > 1:
+                size = int(parts[2]) if len(parts) > 2 else -1
+                message = self.receive_message(parts[1], size)
+                if message is None:
+                    if parts[1] in self.ipc_channels:
+                        print(f"📭 Nothing waiting on {parts[1]}")
+                else:
+                    print(f"📥 {message}")
+
             elif cmd == "game":
                 game_name = parts[1] if len(parts) > 1 else None
-                self.play_game(game_name)
+                self.play_game(game_name, *parts[2:])
 
             elif cmd == "weather":
                 self.check_weather()
@@ -618,7 +1330,7 @@ class MiniOS:
                 self.show_fortune()
 
             elif cmd == "time":
-                print(f"🕒 Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                print(f"🕒 Current time: {self._now().strftime('%Y-%m-%d %H:%M:%S')}")
                 self.award_points(1, "for time awareness")
 
             elif cmd == "history":
@@ -630,32 +1342,124 @@ class MiniOS:
             elif cmd == "points":
                 self.show_points()
 
+            elif cmd == "quota":
+                self.show_quota()
+
             elif cmd == "clear":
                 os.system('cls' if os.name == 'nt' else 'clear')
                 self.award_points(1, "for keeping clean")
 
+            elif cmd == "record" and len(parts) > 1:
+                if parts[1] == "start" and len(parts) > 2:
+                    self.start_recording(parts[2])
+                elif parts[1] == "stop":
+                    self.stop_recording()
+                else:
+                    print("❌ Usage: record start <file> | record stop")
+
+            elif cmd == "replay" and len(parts) > 1:
+                sessions = int(parts[2]) if len(parts) > 2 else 1
+                speed = float(parts[3]) if len(parts) > 3 else 0
+                self.replay_sessions(parts[1], sessions, speed)
+
             elif cmd == "exit":
                 print("🔄 Shutting down system...")
+                if self.recorder:
+                    self.stop_recording()
                 if self.current_user:
                     self._save_user_profile(self.current_user)
                 print("💾 Profiles saved.")
                 print("👋 Goodbye!")
                 self.running = False
 
-            else:
+            elif not self.plugins.run("command", cmd, self, *parts[1:]):
                 print(f"❌ Unknown command: {cmd}")
                 print("💡 Type 'help' for available commands")
 
         except Exception as e:
             print(f"💥 Error executing command: {e}")
 
+    def start_recording(self, path):
+        """Start recording this session's commands and inputs to path"""
+        if self.recorder:
+            print(f"❌ Already recording to {self.recorder.path}")
+            return False
+
+        # Reseed so the replay can reproduce every random draw from here on
+        self.seed = random.randrange(2 ** 32)
+        self.rng.seed(self.seed)
+        self.recorder = SessionRecorder(path, self.seed, self.current_user, self.clock,
+                                        self.snapshot_state())
+        print(f"⏺️ Recording session to {path}")
+        return True
+
+    def snapshot_state(self):
+        """Capture the session state a replay needs to start from.
+
+        Running processes and IPC channels hold live threads and buffers,
+        so they are not part of the snapshot.
+        """
+        bucket = self.rate_limiters.get(self.current_user)
+        return copy.deepcopy({
+            "file_system": self.file_system,
+            "user_points": self.user_points,
+            "system_health": self.system_health,
+            "temperature": self.temperature,
+            "boot_time": self.boot_time.timestamp(),
+            "quota_usage": self.quota_usage,
+            "command_history": list(self.command_history),
+            "rate_limit": [bucket.tokens, bucket.updated] if bucket else None
+        })
+
+    def restore_state(self, state):
+        """Load a snapshot taken by snapshot_state()"""
+        self.file_system = copy.deepcopy(state["file_system"])
+        self._rebuild_usage()
+        self.user_points = state["user_points"]
+        self.system_health = state["system_health"]
+        self.temperature = state["temperature"]
+        self.boot_time = datetime.fromtimestamp(state["boot_time"])
+        self.quota_usage = copy.deepcopy(state["quota_usage"])
+        self.command_history = deque(state["command_history"], maxlen=self.command_history.maxlen)
+        bucket = self._rate_limiter(self.current_user)
+        if bucket and state["rate_limit"]:
+            bucket.tokens, bucket.updated = state["rate_limit"]
+
+    def stop_recording(self):
+        """Stop recording and write the trace file"""
+        if not self.recorder:
+            print("❌ Not recording")
+            return False
+
+        recorder, self.recorder = self.recorder, None
+        recorder.save()
+        print(f"⏹️ Saved {len(recorder.events)} events to {recorder.path}")
+        return True
+
+    def replay_sessions(self, path, sessions=1, speed=0):
+        """Replay a recorded trace as concurrent sessions and report latency"""
+        try:
+            trace = SessionRecorder.load(path)
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot load trace {path}: {e}")
+            return None
+
+        print(f"▶️ Replaying {path} as {sessions} session(s)...")
+        report = ReplayEngine([trace]).run(sessions, speed)
+        latency = report["latency_ms"]
+        print(f"Commands    : {report['commands']} in {report['elapsed']:.3f}s")
+        print(f"Throughput  : {report['throughput']:.0f} commands/s")
+        print(f"Latency (ms): p50 {latency['p50']:.3f} | p95 {latency['p95']:.3f} | "
+              f"p99 {latency['p99']:.3f} | max {latency['max']:.3f}")
+        return report
+
     def _update_system_metrics(self):
         """Update system health metrics randomly"""
         # Random small changes to system metrics
-        self.system_health += random.randint(-2, 2)
+        self.system_health += self.rng.randint(-2, 2)
         self.system_health = max(0, min(100, self.system_health))
 
-        self.temperature += random.randint(-1, 1)
+        self.temperature += self.rng.randint(-1, 1)
         self.temperature = max(20, min(80, self.temperature))
 
     # File system methods (similar to before but enhanced)
@@ -683,20 +1487,34 @@ class MiniOS:
             print(f"{item_type} {item}")
 
     def create_file(self, path, content=""):
-        if path in self.file_system:
-            print(f"❌ File {path} already exists")
-            return False
-
-        self.file_system[path] = {
-            "type": "file",
-            "content": content,
-            "created": datetime.now().isoformat(),
-            "modified": datetime.now().isoformat()
-        }
+        path = self._normalize_path(path)
+        size = len(content.encode("utf-8"))
+        with self._fs_lock:
+            if path in self.file_system:
+                print(f"❌ File {path} already exists")
+                return False
+
+            parent = next(self._parent_dirs(path))
+            if self.file_system.get(parent, {}).get("type") != "directory":
+                print(f"❌ Directory {parent} not found")
+                return False
+
+            if not self._charge_quota(self.current_user, size, inodes=1):
+                return False
+
+            self._store_file(path, {
+                "type": "file",
+                "owner": self.current_user,
+                "content": content,
+                "size": size,
+                "created": self._now().isoformat(),
+                "modified": self._now().isoformat()
+            })
         print(f"✅ File {path} created")
         return True
 
     def read_file(self, path):
+        path = self._normalize_path(path)
         if path not in self.file_system:
             print(f"❌ File {path} not found")
             return None
@@ -708,24 +1526,214 @@ class MiniOS:
         return self.file_system[path]["content"]
 
     def delete_file(self, path):
-        if path not in self.file_system:
-            print(f"❌ File {path} not found")
-            return False
+        path = self._normalize_path(path)
+        with self._fs_lock:
+            if path not in self.file_system:
+                print(f"❌ File {path} not found")
+                return False
+
+            if self.file_system[path]["type"] != "file":
+                print(f"❌ {path} is not a file")
+                return False
+
+            entry = self._discard_file(path)
+            self._release_quota(entry.get("owner"), entry["size"], inodes=1)
+        print(f"✅ File {path} deleted")
+        return True
 
-        if self.file_system[path]["type"] != "file":
-            print(f"❌ {path} is not a file")
+    @staticmethod
+    def _normalize_path(path):
+        """Make a path absolute, collapsing repeated and trailing slashes"""
+        return "/" + "/".join(part for part in path.strip().split("/") if part)
+
+    # Size aggregates: every directory keeps running totals for its subtree
+    @staticmethod
+    def _parent_dirs(path):
+        """Yield each ancestor directory of path, ending with /"""
+        while path != "/":
+            if "/" not in path:
+                yield "/"
+                return
+            path = path.rsplit("/", 1)[0] or "/"
+            yield path
+
+    def _adjust_usage(self, path, size, files):
+        for directory in self._parent_dirs(path):
+            totals = self.dir_usage.get(directory)
+            if totals is None:
+                totals = self.dir_usage[directory] = [0, 0]
+            totals[0] += size
+            totals[1] += files
+
+    def _store_file(self, path, entry):
+        """Add or replace a file entry, updating its ancestors' totals"""
+        entry.setdefault("size", len(entry["content"].encode("utf-8")))
+        with self._fs_lock:
+            old = self.file_system.get(path)
+            if old is not None and old["type"] == "file":
+                self._adjust_usage(path, entry["size"] - old["size"], 0)
+            else:
+                self._adjust_usage(path, entry["size"], 1)
+            self.file_system[path] = entry
+
+    def _discard_file(self, path):
+        """Remove a file entry, updating its ancestors' totals"""
+        with self._fs_lock:
+            entry = self.file_system.pop(path)
+            self._adjust_usage(path, -entry["size"], -1)
+        return entry
+
+    def _rebuild_usage(self):
+        """Recompute all directory totals from scratch (used at boot)"""
+        with self._fs_lock:
+            self.dir_usage = {}
+            for path, entry in self.file_system.items():
+                if entry["type"] == "file":
+                    entry.setdefault("size", len(entry["content"].encode("utf-8")))
+                    self._adjust_usage(path, entry["size"], 1)
+
+    def disk_usage(self, path):
+        """Return (bytes, files) under path in O(1), or None if it doesn't exist"""
+        path = self._normalize_path(path)
+        with self._fs_lock:
+            entry = self.file_system.get(path)
+            if entry is None:
+                return None
+            if entry["type"] == "file":
+                return entry["size"], 1
+            totals = self.dir_usage.get(path, (0, 0))
+            return totals[0], totals[1]
+
+    @staticmethod
+    def _format_size(size):
+        for unit in ("B", "K", "M"):
+            if size < 1024:
+                return f"{size}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+            size /= 1024
+        return f"{size:.1f}G"
+
+    def show_disk_usage(self, path="/"):
+        """du: show the size of a file or directory subtree"""
+        usage = self.disk_usage(path)
+        if usage is None:
+            print(f"❌ {path} not found")
             return False
 
-        del self.file_system[path]
-        print(f"✅ File {path} deleted")
+        size, files = usage
+        print(f"{self._format_size(size):<8} {path} ({files} file{'s' if files != 1 else ''})")
         return True
 
+    def show_disk_free(self):
+        """df: show used and available space on the simulated disk"""
+        used, files = self.disk_usage("/")
+        available = max(self.DISK_CAPACITY - used, 0)
+        percent = used * 100 // self.DISK_CAPACITY
+
+        print(f"{'Filesystem':<12} {'Size':>8} {'Used':>8} {'Avail':>8} {'Use%':>5} {'Files':>6}  Mounted on")
+        print(f"{'minifs':<12} {self._format_size(self.DISK_CAPACITY):>8} {self._format_size(used):>8} "
+              f"{self._format_size(available):>8} {percent:>4}% {files:>6}  /")
+
     def kill_process(self, pid):
-        if pid in self.processes:
-            self.processes[pid]["status"] = "terminated"
-            print(f"🔴 Process {pid} terminated")
-        else:
+        """Ask a process to stop.
+
+        Threads can't be killed, so this only flags the process; its quota
+        stays charged until the thread actually returns.
+        """
+        if pid not in self.processes:
             print(f"❌ Process {pid} not found")
+            return
+
+        process = self.processes[pid]
+        with self._quota_lock:
+            if process["status"] != "running":
+                print(f"❌ Process {pid} is not running")
+                return
+            process["status"] = "terminated"
+        process["stop"].set()
+        print(f"🔴 Process {pid} terminated")
+
+    def stop_requested(self):
+        """True when the calling process has been killed and should return"""
+        pid = getattr(self._process_context, "pid", None)
+        return pid is not None and self.processes[pid]["stop"].is_set()
+
+    def _end_process(self, pid):
+        """Called once when a process thread returns; releases its quota"""
+        process = self.processes[pid]
+        with self._quota_lock:
+            if process["status"] == "running":
+                process["status"] = "exited"
+        self._release_quota(process.get("owner"), processes=1)
+
+    # IPC methods: named pipes and message queues shared by processes
+    def create_pipe(self, name, capacity=65536):
+        """Create a named byte pipe that processes can open by name"""
+        if name in self.ipc_channels:
+            print(f"❌ IPC channel {name} already exists")
+            return None
+
+        channel = Pipe(capacity)
+        self.ipc_channels[name] = channel
+        print(f"✅ Pipe {name} created ({capacity} bytes)")
+        return channel
+
+    def create_message_queue(self, name, maxsize=1024, msg_type=None):
+        """Create a named message queue that processes can open by name"""
+        if name in self.ipc_channels:
+            print(f"❌ IPC channel {name} already exists")
+            return None
+
+        channel = MessageQueue(maxsize, msg_type)
+        self.ipc_channels[name] = channel
+        print(f"✅ Message queue {name} created ({maxsize} messages)")
+        return channel
+
+    def open_channel(self, name):
+        """Look up a pipe or message queue, e.g. from a process target"""
+        channel = self.ipc_channels.get(name)
+        if channel is None:
+            print(f"❌ IPC channel {name} not found")
+        return channel
+
+    def send_message(self, name, message):
+        """Send text to a channel without blocking the shell"""
+        channel = self.open_channel(name)
+        if channel is None:
+            return False
+
+        if isinstance(channel, Pipe):
+            data = message.encode("utf-8")
+            if len(data) > channel.capacity:
+                print(f"❌ Message is larger than pipe {name} ({channel.capacity} bytes)")
+                return False
+            # All or nothing, so readers never see half a message
+            if not channel.write(data, block=False, atomic=True):
+                print(f"⚠️ Pipe {name} is full, message not sent")
+                return False
+        else:
+            try:
+                channel.put(message, block=False)
+            except queue.Full:
+                print(f"⚠️ Message queue {name} is full")
+                return False
+            except TypeError as e:
+                print(f"❌ {e}")
+                return False
+        return True
+
+    def receive_message(self, name, size=-1):
+        """Receive pending data from a channel without blocking the shell"""
+        channel = self.open_channel(name)
+        if channel is None:
+            return None
+
+        if isinstance(channel, Pipe):
+            data = channel.read(size, block=False)
+            return None if data is None else data.decode("utf-8", errors="replace")
+        try:
+            return str(channel.get(block=False))
+        except queue.Empty:
+            return None
 
     def start_shell(self):
         """Start the enhanced command line interface"""
@@ -734,13 +1742,13 @@ class MiniOS:
         print("🏆 Earn points by using the system!\n")
 
         # Start only essential background processes
-        self.create_process("system_health", self._system_health_monitor)
+        self.create_process("system_health", self._system_health_monitor, system=True)
 
         while self.running:
             try:
                 # Dynamic prompt with system info
                 prompt = f"\n{self.current_user}@MiniOS[{self.user_points}pts]$ "
-                command = input(prompt).strip()
+                command = self.input_func(prompt).strip()
                 self.run_command(command)
 
             except KeyboardInterrupt:
@@ -753,12 +1761,13 @@ class MiniOS:
 
     def _system_health_monitor(self):
         """Background system health monitoring (only runs occasionally)"""
-        while self.running:
+        while self.running and not self.stop_requested():
             time.sleep(30)  # Only check every 30 seconds
-            if not self.running:
+            if not self.running or self.stop_requested():
                 break
 
-            # Only print messages occasionally
+            # Only print messages occasionally; the global RNG keeps this
+            # background chatter from perturbing the replayable session RNG
             if random.random() < 0.3:  # 30% chance
                 messages = [
                     "🔍 System scan: All services normal",
@@ -768,6 +1777,95 @@ class MiniOS:
                 ]
                 print(f"\n[System] {random.choice(messages)}")
 
+class ReplayEngine:
+    """Replays recorded sessions concurrently against fresh MiniOS instances.
+
+    Each session starts from the state snapshot in the trace header with
+    its own seeded RNG and virtual clock, so it follows the recorded run
+    (event times are kept to the millisecond). speed scales the recorded pauses between
+    commands (10 replays ten times faster); 0 runs as fast as possible.
+    """
+
+    def __init__(self, traces, factory=MiniOS):
+        self.traces = [SessionRecorder.load(t) if isinstance(t, str) else t for t in traces]
+        self.factory = factory
+
+    def _replay(self, trace, speed, latencies):
+        header, events = trace
+        started = header["started"]
+        clock = VirtualClock(started)
+        inputs = deque((t, text) for t, kind, text in events if kind == "i")
+
+        def feed_input(prompt=""):
+            if not inputs:
+                raise EOFError("trace has no more recorded input")
+            t, text = inputs.popleft()
+            clock.now = max(clock.now, started + t / 1000)
+            return text
+
+        os_system = self.factory(seed=header["seed"], clock=clock.time,
+                                 input_func=feed_input, sleep=clock.sleep)
+        os_system.current_user = header["user"]
+        if header.get("state"):
+            os_system.restore_state(header["state"])
+        else:
+            os_system._init_file_system()
+            if header["user"]:
+                os_system._create_user_directory(header["user"])
+
+        wall_start = time.perf_counter()
+        for t, kind, text in events:
+            if kind != "c":
+                continue
+            if speed:
+                delay = wall_start + t / 1000 / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            clock.now = max(clock.now, started + t / 1000)
+
+            begin = time.perf_counter()
+            os_system.run_command(text)
+            latencies.append(time.perf_counter() - begin)
+
+    def run(self, sessions=None, speed=0, quiet=True):
+        """Run sessions (default one per trace) and return a latency report"""
+        sessions = sessions or len(self.traces)
+        latencies = [[] for _ in range(sessions)]
+        threads = [
+            threading.Thread(target=self._replay,
+                             args=(self.traces[i % len(self.traces)], speed, latencies[i]),
+                             daemon=True)
+            for i in range(sessions)
+        ]
+
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext():
+                start = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - start
+
+        samples = sorted(sample for session in latencies for sample in session)
+
+        def percentile(q):
+            return samples[int(q * (len(samples) - 1))] * 1000 if samples else 0.0
+
+        return {
+            "sessions": sessions,
+            "commands": len(samples),
+            "elapsed": elapsed,
+            "throughput": len(samples) / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": samples[-1] * 1000 if samples else 0.0
+            }
+        }
+
+
 def main():
     """Main function to run the enhanced MiniOS"""
     os_system = MiniOS()
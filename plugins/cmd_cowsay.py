@@ -0,0 +1,13 @@
+"""cowsay plugin: let a cow say something for you"""
+
+
+def run(os_system, *args):
+    message = " ".join(args) or "Moo! Try 'cowsay <message>'"
+    border = "-" * (len(message) + 2)
+    print(f"\n {border}\n< {message} >\n {border}")
+    print(r"""        \   ^__^
+         \  (oo)\_______
+            (__)\       )\/\
+                ||----w |
+                ||     ||""")
+    os_system.award_points(1, "for talking to cows")
@@ -0,0 +1,16 @@
+"""Coin flip plugin game"""
+
+
+def run(os_system, *args):
+    print("\n🪙 Coin Flip!")
+    call = (args[0] if args else os_system.read_input("Heads or tails? ")).strip().lower()
+    if call not in ("heads", "tails"):
+        print("❌ Please call heads or tails!")
+        return
+
+    result = os_system.rng.choice(["heads", "tails"])
+    print(f"The coin shows {result}!")
+    if call == result:
+        os_system.award_points(10, "for a lucky call")
+    else:
+        os_system.award_points(1, "for flipping a coin")
@@ -0,0 +1,104 @@
+import contextlib
+import io
+import random
+import threading
+
+from mini import MiniOS
+
+
+def make_os():
+    os_system = MiniOS()
+    os_system._init_file_system()
+    os_system.current_user = "admin"
+    os_system._create_user_directory("admin")
+    return os_system
+
+
+def recount(os_system):
+    """Aggregate totals the slow way, by scanning every file"""
+    totals = {}
+    for path, entry in os_system.file_system.items():
+        if entry["type"] == "file":
+            for directory in MiniOS._parent_dirs(path):
+                usage = totals.setdefault(directory, [0, 0])
+                usage[0] += len(entry["content"].encode("utf-8"))
+                usage[1] += 1
+    return totals
+
+
+def assert_aggregates_exact(os_system):
+    expected = recount(os_system)
+    for directory, usage in os_system.dir_usage.items():
+        assert usage == expected.get(directory, [0, 0]), directory
+
+
+def test_create_and_delete_update_ancestors():
+    os_system = make_os()
+    before = os_system.disk_usage("/")
+    welcome = os_system.file_system["/home/admin/welcome.txt"]["size"]
+    os_system.create_file("/home/admin/notes.txt", "héllo")
+    assert os_system.disk_usage("/home/admin") == (welcome + 6, 2)
+    assert os_system.disk_usage("/") == (before[0] + 6, before[1] + 1)
+
+    os_system.delete_file("/home/admin/notes.txt")
+    assert os_system.disk_usage("/") == before
+    assert_aggregates_exact(os_system)
+
+
+def test_profile_overwrite_adjusts_bytes_only():
+    os_system = make_os()
+    os_system._save_user_profile("admin")
+    files = os_system.disk_usage("/system")[1]
+    os_system.user_points = 123456
+    os_system._save_user_profile("admin")
+    assert os_system.disk_usage("/system")[1] == files
+    assert_aggregates_exact(os_system)
+
+
+def test_paths_are_normalised():
+    os_system = make_os()
+    assert os_system.create_file("notes.txt", "hi")
+    assert os_system.read_file("/notes.txt") == "hi"
+    assert os_system.create_file("/home//y.txt", "abc")
+    assert os_system.read_file("home/y.txt") == "abc"
+    assert os_system.create_file("/home/x/", "q")
+    assert "/home/x" in os_system.file_system
+    assert "/home/" not in os_system.dir_usage
+    assert "/home/x" not in os_system.dir_usage
+    assert os_system.delete_file("notes.txt")
+
+
+def test_missing_paths_and_parents():
+    os_system = make_os()
+    assert not os_system.create_file("/nope/x.txt", "abc")
+    assert not os_system.create_file("/system/readme.txt/x", "abc")
+    assert os_system.disk_usage("/nope") is None
+    assert "/nope" not in os_system.dir_usage
+    assert os_system.disk_usage("/games/instructions.txt")[1] == 1
+
+
+def test_aggregates_exact_under_concurrent_mutation():
+    os_system = make_os()
+    for d in range(4):
+        os_system.file_system[f"/home/admin/d{d}"] = {"type": "directory", "contents": {}}
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(300):
+            path = f"/home/admin/d{rng.randrange(4)}/f{rng.randrange(25)}"
+            if rng.random() < 0.6:
+                os_system.create_file(path, "x" * rng.randrange(50))
+            else:
+                os_system.delete_file(path)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert_aggregates_exact(os_system)
+    expected = recount(os_system)["/home/admin"]
+    assert list(os_system.disk_usage("/home/admin")) == expected
+    assert os_system.quota_usage["admin"]["inodes"] == expected[1] - 1  # welcome.txt is a system file
@@ -0,0 +1,140 @@
+import queue
+import threading
+
+import pytest
+
+from mini import MessageQueue, MiniOS, Pipe
+
+
+def test_pipe_wraps_around_ring_buffer():
+    pipe = Pipe(8)
+    assert pipe.write(b"abcdef") == 6
+    assert pipe.read(4) == b"abcd"
+    # Head is at 4, so this write wraps past the end of the buffer
+    assert pipe.write(b"ghijkl") == 6
+    assert len(pipe) == 8
+    assert pipe.read() == b"efghijkl"
+
+
+def test_pipe_readinto_across_wraparound():
+    pipe = Pipe(4)
+    pipe.write(b"xyz")
+    pipe.read(2)
+    pipe.write(b"abc")
+    buffer = bytearray(8)
+    assert pipe.readinto(buffer) == 4
+    assert bytes(buffer[:4]) == b"zabc"
+
+
+def test_pipe_non_blocking_write_stores_what_fits():
+    pipe = Pipe(4)
+    assert pipe.write(b"abcdef", block=False) == 4
+    assert pipe.write(b"g", block=False) == 0
+    assert pipe.read() == b"abcd"
+
+
+def test_pipe_atomic_write_is_all_or_nothing():
+    pipe = Pipe(8)
+    pipe.write(b"12345")
+    assert pipe.write(b"abcd", block=False, atomic=True) == 0
+    assert pipe.write(b"abc", block=False, atomic=True) == 3
+    assert pipe.read() == b"12345abc"
+    with pytest.raises(ValueError):
+        pipe.write(b"123456789", atomic=True)
+
+
+def test_pipe_empty_read_and_eof():
+    pipe = Pipe(4)
+    assert pipe.read(block=False) is None
+    assert pipe.readinto(bytearray(4), block=False) is None
+    with pytest.raises(ValueError):
+        pipe.readinto(bytearray(0))
+    pipe.write(b"ab")
+    pipe.close()
+    assert pipe.read() == b"ab"
+    assert pipe.read() == b""
+    assert pipe.readinto(bytearray(4)) == 0
+    with pytest.raises(BrokenPipeError):
+        pipe.write(b"c")
+
+
+def test_pipe_transfers_between_threads():
+    pipe = Pipe(64)
+    data = bytes(range(256)) * 200
+    received = bytearray()
+
+    def reader():
+        buffer = bytearray(50)
+        while True:
+            count = pipe.readinto(buffer)
+            if not count:
+                return
+            received.extend(buffer[:count])
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    assert pipe.write(data) == len(data)
+    pipe.close()
+    thread.join(5)
+    assert bytes(received) == data
+
+
+def test_message_queue_rejects_wrong_type():
+    channel = MessageQueue(4, int)
+    with pytest.raises(TypeError):
+        channel.put("one")
+    with pytest.raises(TypeError):
+        channel.put_many([1, "two"])
+    assert len(channel) == 0
+
+
+def test_message_queue_put_many_partial_batch():
+    channel = MessageQueue(3)
+    assert channel.put_many([1, 2, 3, 4, 5], block=False) == 3
+    with pytest.raises(queue.Full):
+        channel.put(6, block=False)
+    assert channel.put_many([7], timeout=0.01) == 0
+
+
+def test_message_queue_get_many_partial_batch():
+    channel = MessageQueue(10)
+    channel.put_many(range(5))
+    assert channel.get_many(2) == [0, 1]
+    assert channel.get_many() == [2, 3, 4]
+    assert channel.get_many(block=False) == []
+    with pytest.raises(queue.Empty):
+        channel.get(block=False)
+
+
+def test_message_queue_backpressure_releases_writer():
+    channel = MessageQueue(2)
+    total = 1000
+    received = []
+
+    def consumer():
+        while len(received) < total:
+            received.extend(channel.get_many(timeout=5))
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    assert channel.put_many(range(total)) == total
+    thread.join(5)
+    assert received == list(range(total))
+
+
+def test_send_rejects_message_that_does_not_fit(capsys):
+    os_system = MiniOS()
+    os_system.run_command("mkfifo p 8")
+    os_system.run_command("send p hello there world")
+    os_system.run_command("send p hello")
+    os_system.run_command("send p there")
+    assert os_system.receive_message("p") == "hello"
+    assert "not sent" in capsys.readouterr().out
+
+
+def test_mkfifo_validates_arguments(capsys):
+    os_system = MiniOS()
+    for command in ("mkfifo x abc", "mkfifo -q", "mkfifo -q q 0"):
+        os_system.run_command(command)
+    assert os_system.ipc_channels == {}
+    assert capsys.readouterr().out.count("Usage: mkfifo") == 3
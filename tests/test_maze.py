@@ -0,0 +1,82 @@
+from collections import deque
+
+import pytest
+
+from mini import Maze
+
+
+def reference_distances(maze, start):
+    """Plain BFS over can_move, independent of the bit tricks in solve()"""
+    distances = {start: 0}
+    pending = deque([start])
+    while pending:
+        x, y = pending.popleft()
+        for direction in ("north", "south", "east", "west"):
+            if maze.can_move(x, y, direction):
+                dx, dy = Maze.DIRECTIONS[direction]
+                neighbour = (x + dx, y + dy)
+                if neighbour not in distances:
+                    distances[neighbour] = distances[(x, y)] + 1
+                    pending.append(neighbour)
+    return distances
+
+
+def count_passages(maze):
+    return sum(
+        maze.can_move(x, y, "south") + maze.can_move(x, y, "east")
+        for y in range(maze.height) for x in range(maze.width)
+    )
+
+
+@pytest.mark.parametrize("width,height,seed", [(1, 1, 0), (1, 7, 1), (9, 1, 2), (12, 8, 3), (20, 20, 4)])
+def test_maze_is_perfect(width, height, seed):
+    maze = Maze(width, height, seed)
+    # Connected with exactly cells - 1 passages means a spanning tree
+    assert len(reference_distances(maze, (0, 0))) == width * height
+    assert count_passages(maze) == width * height - 1
+
+
+def test_no_passage_leaves_the_grid():
+    maze = Maze(6, 5, 7)
+    for x in range(6):
+        assert not maze.can_move(x, 0, "north")
+        assert not maze.can_move(x, 4, "south")
+    for y in range(5):
+        assert not maze.can_move(0, y, "west")
+        assert not maze.can_move(5, y, "east")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_solve_returns_shortest_valid_route(seed):
+    maze = Maze(15, 11, seed)
+    start, goal = (3, 9), (14, 0)
+    route = maze.solve(start, goal)
+
+    assert route[0] == start and route[-1] == goal
+    assert len(route) - 1 == reference_distances(maze, start)[goal]
+    for (x, y), (nx, ny) in zip(route, route[1:]):
+        direction = next(d for d in ("north", "south", "east", "west")
+                         if Maze.DIRECTIONS[d] == (nx - x, ny - y))
+        assert maze.can_move(x, y, direction)
+
+
+def test_same_seed_same_maze():
+    assert Maze(30, 30, 42).grid == Maze(30, 30, 42).grid
+    assert Maze(30, 30, 42).grid != Maze(30, 30, 43).grid
+
+
+def test_routes_are_not_a_fixed_shape():
+    # An unbiased maze needs west and north moves to cross it for some seeds
+    moves = set()
+    for seed in range(5):
+        route = Maze(30, 30, seed).solve((0, 0), (29, 29))
+        moves.update((nx - x, ny - y) for (x, y), (nx, ny) in zip(route, route[1:]))
+    assert moves == {(0, -1), (0, 1), (1, 0), (-1, 0)}
+
+
+def test_hint_follows_route():
+    maze = Maze(10, 10, 5)
+    route = maze.solve((0, 0), (9, 9))
+    dx, dy = Maze.DIRECTIONS[maze.hint((0, 0), (9, 9))]
+    assert (dx, dy) == (route[1][0] - route[0][0], route[1][1] - route[0][1])
+    assert maze.hint((9, 9), (9, 9)) is None
@@ -0,0 +1,113 @@
+import threading
+import time
+
+from mini import MiniOS, TokenBucket, VirtualClock
+
+
+def make_os(user="user", **kwargs):
+    os_system = MiniOS(**kwargs)
+    os_system._init_file_system()
+    os_system.current_user = user
+    return os_system
+
+
+def wait_for_exit(os_system, pid):
+    os_system.processes[pid]["thread"].join(5)
+
+
+def test_file_quota_charged_and_released():
+    os_system = make_os()
+    assert os_system.create_file("/home/a.txt", "hello")
+    assert os_system.create_file("/home/b.txt", "héllo")
+    assert os_system.quota_usage["user"] == {"bytes": 11, "inodes": 2, "processes": 0}
+
+    assert os_system.delete_file("/home/a.txt")
+    assert os_system.quota_usage["user"] == {"bytes": 6, "inodes": 1, "processes": 0}
+
+
+def test_file_quota_limits_bytes_and_inodes():
+    os_system = make_os()
+    os_system.set_user_limits("user", bytes=10, inodes=1)
+    assert not os_system.create_file("/home/big.txt", "x" * 11)
+    assert os_system.create_file("/home/a.txt", "x" * 10)
+    assert not os_system.create_file("/home/b.txt", "")
+    assert "/home/big.txt" not in os_system.file_system
+    assert "/home/b.txt" not in os_system.file_system
+
+    os_system.delete_file("/home/a.txt")
+    assert os_system.create_file("/home/b.txt", "")
+
+
+def test_process_quota_held_until_thread_exits():
+    os_system = make_os("guest")
+    release = threading.Event()
+    pids = [os_system.create_process("worker", release.wait) for _ in range(2)]
+    assert os_system.create_process("extra", release.wait) is None
+
+    # Killing only flags the process; its thread is still alive
+    os_system.kill_process(pids[0])
+    assert os_system.processes[pids[0]]["status"] == "terminated"
+    assert os_system.quota_usage["guest"]["processes"] == 2
+    assert os_system.create_process("extra", release.wait) is None
+
+    release.set()
+    for pid in pids:
+        wait_for_exit(os_system, pid)
+    assert os_system.quota_usage["guest"]["processes"] == 0
+    assert os_system.processes[pids[1]]["status"] == "exited"
+
+
+def test_killed_process_sees_stop_request():
+    os_system = make_os("guest")
+    started = threading.Event()
+
+    def worker():
+        started.set()
+        while not os_system.stop_requested():
+            time.sleep(0.01)
+
+    pid = os_system.create_process("worker", worker)
+    started.wait(5)
+    os_system.kill_process(pid)
+    wait_for_exit(os_system, pid)
+    assert os_system.quota_usage["guest"]["processes"] == 0
+
+
+def test_system_processes_skip_quota():
+    os_system = make_os("guest")
+    release = threading.Event()
+    pid = os_system.create_process("daemon", release.wait, system=True)
+    assert os_system.processes[pid]["owner"] is None
+    assert os_system.create_process("a", release.wait) is not None
+    assert os_system.create_process("b", release.wait) is not None
+    release.set()
+
+
+def test_token_bucket_refills_with_clock():
+    clock = VirtualClock(100.0)
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock.time)
+    assert [bucket.consume() for _ in range(4)] == [True, True, True, False]
+
+    clock.sleep(0.5)  # One token back at 2 per second
+    assert bucket.consume()
+    assert not bucket.consume()
+
+    clock.sleep(60)  # Refill is capped at capacity
+    assert [bucket.consume() for _ in range(4)] == [True, True, True, False]
+
+
+def test_run_command_rate_limited_per_role(capsys):
+    clock = VirtualClock(0.0)
+    os_system = make_os("guest", clock=clock.time)
+    for _ in range(6):
+        os_system.run_command("time")
+    assert capsys.readouterr().out.count("rate limit") == 1
+
+    clock.sleep(1)
+    os_system.run_command("time")
+    assert "rate limit" not in capsys.readouterr().out
+
+    os_system.current_user = "admin"
+    for _ in range(50):
+        os_system.run_command("time")
+    assert "rate limit" not in capsys.readouterr().out
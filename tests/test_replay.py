@@ -0,0 +1,62 @@
+import contextlib
+import io
+
+from mini import MiniOS, ReplayEngine, SessionRecorder, VirtualClock
+
+
+def run_commands(os_system, commands, clock):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        for command in commands:
+            clock.sleep(1.5)
+            os_system.run_command(command)
+    return output.getvalue()
+
+
+def test_replay_reproduces_recorded_output(tmp_path):
+    trace = str(tmp_path / "session.trace")
+    clock = VirtualClock(1_700_000_000.0)
+    answers = iter(["hello", "50", "25", "75", "12", "60", "40", "30", "B", "B", "A"])
+    os_system = MiniOS(seed=7, clock=clock.time, input_func=lambda prompt="": next(answers),
+                       sleep=clock.sleep)
+    os_system._init_file_system()
+    os_system.current_user = "guest"
+    os_system._create_user_directory("guest")
+
+    # State built up before recording starts must be part of the trace
+    run_commands(os_system, ["create /home/guest/pre.txt", "fortune", "points"], clock)
+    os_system.run_command("record start " + trace)
+
+    commands = ["read /home/guest/pre.txt", "game guess", "weather", "fortune",
+                "game trivia", "du /home", "quota", "history", "info", "points"]
+    recorded = run_commands(os_system, commands, clock)
+    os_system.run_command("record stop")
+
+    header, events = SessionRecorder.load(trace)
+    assert [text for _, kind, text in events if kind == "c"] == commands
+
+    replayed = io.StringIO()
+    with contextlib.redirect_stdout(replayed):
+        report = ReplayEngine([trace]).run(1, quiet=False)
+
+    assert "hello" in recorded and "not found" not in recorded
+    assert replayed.getvalue() == recorded
+    assert report["commands"] == len(commands)
+
+
+def test_concurrent_replays_report_latency(tmp_path):
+    trace = str(tmp_path / "session.trace")
+    os_system = MiniOS()
+    os_system._init_file_system()
+    os_system.current_user = "admin"
+    with contextlib.redirect_stdout(io.StringIO()):
+        os_system.run_command("record start " + trace)
+        for command in ("fortune", "ls /", "df"):
+            os_system.run_command(command)
+        os_system.run_command("record stop")
+
+    report = ReplayEngine([trace]).run(sessions=8)
+    assert report["sessions"] == 8
+    assert report["commands"] == 24
+    latency = report["latency_ms"]
+    assert 0 <= latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]